@@ -25,6 +25,25 @@ local Logger = {
 		Error = true,
 	},
 	ReloadCallback = nil, -- Added for reload support
+	-- Server-driven remote control (updated from every /logs response)
+	RemoteControl = {
+		MinLevel = "Info",
+		InfoSampleRate = 1,
+		BatchInterval = 0,
+		ExpiresAt = nil, -- os.clock() after which the defaults apply again
+	},
+	RemoteQueue = {},
+	RemoteQueueMax = 500,
+	RemoteFlushScheduled = false,
+	RemoteFiltered = 0,
+}
+
+-- Level ranks used by the remote control filter
+local LevelRank = {
+	Info = 1,
+	Success = 1,
+	Warning = 2,
+	Error = 3,
 }
 
 -- Colors for log levels
@@ -276,6 +295,121 @@ function Logger.RefreshDisplay()
 	end
 end
 
+-- Apply the control block returned by the log server
+local function ApplyRemoteControl(response)
+	if not response or type(response.Body) ~= "string" then
+		return
+	end
+
+	local ok, data = pcall(function()
+		return HttpService:JSONDecode(response.Body)
+	end)
+	if not ok or type(data) ~= "table" or type(data.control) ~= "table" then
+		return
+	end
+
+	local control = data.control
+	local ttl = tonumber(control.ttl)
+	Logger.RemoteControl.MinLevel = LevelRank[control.minLevel] and control.minLevel or "Info"
+	Logger.RemoteControl.InfoSampleRate = tonumber(control.infoSampleRate) or 1
+	Logger.RemoteControl.BatchInterval = tonumber(control.batchInterval) or 0
+	Logger.RemoteControl.ExpiresAt = ttl and ttl > 0 and os.clock() + ttl or nil
+end
+
+-- Drop an expired control block so a muted client sends (and re-asks) again
+local function CheckRemoteControlExpiry()
+	local control = Logger.RemoteControl
+	if control.ExpiresAt and os.clock() >= control.ExpiresAt then
+		control.MinLevel = "Info"
+		control.InfoSampleRate = 1
+		control.BatchInterval = 0
+		control.ExpiresAt = nil
+	end
+end
+
+-- POST a payload to the log server
+local function PostRemote(data)
+	task.spawn(function()
+		pcall(function()
+			local payload = HttpService:JSONEncode(data)
+
+			local request = http_request or (syn and syn.request) or request
+			if request then
+				local response = request({
+					Url = Logger.RemoteURL,
+					Method = "POST",
+					Headers = { ["Content-Type"] = "application/json" },
+					Body = payload,
+				})
+				ApplyRemoteControl(response)
+			end
+		end)
+	end)
+end
+
+-- Send queued logs as one batch
+local function FlushRemote()
+	Logger.RemoteFlushScheduled = false
+	if #Logger.RemoteQueue == 0 or not Logger.RemoteURL then
+		return
+	end
+
+	local logs = Logger.RemoteQueue
+	Logger.RemoteQueue = {}
+	PostRemote({
+		type = "batch",
+		userId = LocalPlayer and LocalPlayer.UserId or 0,
+		username = LocalPlayer and LocalPlayer.Name or "Unknown",
+		batchInterval = Logger.RemoteControl.BatchInterval,
+		logs = logs,
+	})
+end
+
+-- Filter/sample/batch a log according to the server's control block
+local function SendRemote(log)
+	CheckRemoteControlExpiry()
+	local control = Logger.RemoteControl
+	local rank = LevelRank[log.Level] or 1
+
+	if rank < (LevelRank[control.MinLevel] or 1) then
+		Logger.RemoteFiltered = Logger.RemoteFiltered + 1
+		return
+	end
+	if rank == 1 and control.InfoSampleRate < 1 and math.random() > control.InfoSampleRate then
+		Logger.RemoteFiltered = Logger.RemoteFiltered + 1
+		return
+	end
+
+	local entry = {
+		message = log.Message,
+		level = log.Level,
+		time = log.Time,
+		timestamp = log.Timestamp,
+		userId = LocalPlayer and LocalPlayer.UserId or 0,
+		username = LocalPlayer and LocalPlayer.Name or "Unknown",
+	}
+
+	if control.BatchInterval <= 0 then
+		if #Logger.RemoteQueue > 0 then
+			table.insert(Logger.RemoteQueue, entry)
+			FlushRemote()
+		else
+			PostRemote(entry)
+		end
+		return
+	end
+
+	table.insert(Logger.RemoteQueue, entry)
+	while #Logger.RemoteQueue > Logger.RemoteQueueMax do
+		table.remove(Logger.RemoteQueue, 1)
+	end
+
+	if not Logger.RemoteFlushScheduled then
+		Logger.RemoteFlushScheduled = true
+		task.delay(control.BatchInterval, FlushRemote)
+	end
+end
+
 -- Add log
 function Logger.Add(message, level)
 	level = level or "Info"
@@ -302,28 +436,7 @@ function Logger.Add(message, level)
 
 	-- Send to remote server
 	if Logger.RemoteEnabled and Logger.RemoteURL then
-		task.spawn(function()
-			pcall(function()
-				local payload = HttpService:JSONEncode({
-					message = log.Message,
-					level = log.Level,
-					time = log.Time,
-					timestamp = log.Timestamp,
-					userId = LocalPlayer and LocalPlayer.UserId or 0,
-					username = LocalPlayer and LocalPlayer.Name or "Unknown",
-				})
-
-				local request = http_request or (syn and syn.request) or request
-				if request then
-					request({
-						Url = Logger.RemoteURL,
-						Method = "POST",
-						Headers = { ["Content-Type"] = "application/json" },
-						Body = payload,
-					})
-				end
-			end)
-		end)
+		SendRemote(log)
 	end
 end
 
@@ -366,6 +479,7 @@ end
 
 -- Destroy Logger (Cleanup)
 function Logger.Destroy()
+	FlushRemote()
 	if Logger.UI and Logger.UI.Gui then
 		Logger.UI.Gui:Destroy()
 	end
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Log Control Benchmark
+Floods debug_server with log events from several fake clients and compares
+server CPU time and event loss with and without the adaptive control block.
+Also checks that an Info-only client muted by an operator override starts
+sending again once the override is removed (control blocks expire).
+
+"without control" is the current server with its defaults (bounded ingest
+queue, RATE_LIMIT_DROP off), not the old synchronous v2.1 server. Pass
+"drop" as 4th argument to turn on the server's opt-in Info rate-limit drop.
+
+Usage: python3 bench_log_control.py [clients] [events_per_sec] [seconds] [drop]
+"""
+
+import json
+import multiprocessing
+import os
+import random
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+# Defaults (override from the command line)
+CLIENTS = 8
+EVENTS_PER_SEC = 300  # Per client
+DURATION = 10  # Seconds per run
+DRAIN_TIMEOUT = 10  # Seconds to wait for the writer to catch up
+
+# Override check: Info-only client, muted for the first half of the run
+OVERRIDE_RATE = 20
+OVERRIDE_DURATION = 8
+OVERRIDE_TTL = 2
+
+LEVELS = ["Info"] * 89 + ["Warning"] * 10 + ["Error"]
+RANKS = {"Info": 1, "Warning": 2, "Error": 3}
+DEFAULT_CONTROL = {"minLevel": "Info", "infoSampleRate": 1.0, "batchInterval": 0}
+
+
+def run_server(port_queue, stats_queue, stop_event, log_dir, settings=None):
+    """Server process: serve until stop_event, then report stats"""
+    # Write logs into log_dir and keep terminal output out of the way
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    os.chdir(log_dir)
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")
+
+    import debug_server
+
+    for name, value in (settings or {}).items():
+        setattr(debug_server, name, value)
+
+    debug_server.start_ingest_worker()
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    socketserver.ThreadingTCPServer.daemon_threads = True
+    httpd = socketserver.ThreadingTCPServer(
+        ("127.0.0.1", 0), debug_server.LogHandler
+    )
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    port_queue.put(httpd.server_address[1])
+
+    stop_event.wait()
+    cpu_load = time.process_time()
+
+    # Give the writer thread a chance to flush what was accepted
+    debug_server.drain_ingest_queue(DRAIN_TIMEOUT)
+
+    httpd.shutdown()
+    stats = debug_server.get_ingest_stats()
+    stats["cpu"] = cpu_load
+    stats["cpu_total"] = time.process_time()
+    stats_queue.put(stats)
+
+
+def post(url, data):
+    """POST JSON and return the decoded response (None on failure)"""
+    req = urllib.request.Request(
+        url,
+        data=json.dumps(data).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+    except Exception:
+        return None
+
+
+class ClientControl:
+    """Client-side copy of the control block, mirroring Logger.lua"""
+
+    def __init__(self):
+        self.block = dict(DEFAULT_CONTROL)
+        self.expires = None
+
+    def update(self, response):
+        control = response.get("control") if response else None
+        if not isinstance(control, dict):
+            return
+        self.block.update(control)
+        ttl = control.get("ttl")
+        self.expires = time.monotonic() + ttl if ttl else None
+
+    def get(self):
+        if self.expires and time.monotonic() >= self.expires:
+            self.block = dict(DEFAULT_CONTROL)
+            self.expires = None
+        return self.block
+
+    def allows(self, level, rng):
+        block = self.get()
+        if RANKS[level] < RANKS.get(block["minLevel"], 1):
+            return False
+        return level != "Info" or rng.random() <= block["infoSampleRate"]
+
+
+def run_client(url, index, rate, duration, use_control, results):
+    """Generate events at a fixed rate, optionally honoring the control block"""
+    username = f"BenchUser{index}"
+    rng = random.Random(index)
+    client_control = ClientControl()
+    control = client_control.get()
+
+    stats = {"generated": 0, "filtered": 0, "sent": 0, "requests": 0, "failed": 0}
+    generated_levels = {level: 0 for level in RANKS}
+    pending = []
+    last_flush = start = time.monotonic()
+
+    def send(events):
+        if len(events) == 1 and not (use_control and control["batchInterval"] > 0):
+            body = events[0]
+        else:
+            body = {
+                "type": "batch",
+                "username": username,
+                "batchInterval": control["batchInterval"],
+                "logs": events,
+            }
+        stats["requests"] += 1
+        response = post(url, body)
+        if response is None:
+            stats["failed"] += len(events)
+            return
+        stats["sent"] += len(events)
+        if use_control:
+            client_control.update(response)
+
+    while True:
+        now = time.monotonic()
+        if now - start >= duration:
+            break
+        control = client_control.get()
+
+        due = int((now - start) * rate) - stats["generated"]
+        for _ in range(due):
+            stats["generated"] += 1
+            level = rng.choice(LEVELS)
+            generated_levels[level] += 1
+            if use_control and not client_control.allows(level, rng):
+                stats["filtered"] += 1
+                continue
+            pending.append(
+                {
+                    "message": f"event {stats['generated']}",
+                    "level": level,
+                    "time": time.strftime("%H:%M:%S"),
+                    "timestamp": int(time.time()),
+                    "username": username,
+                }
+            )
+
+        if not pending:
+            time.sleep(0.001)
+        elif use_control and control["batchInterval"] > 0:
+            if now - last_flush >= control["batchInterval"]:
+                send(pending)
+                pending = []
+                last_flush = now
+            else:
+                time.sleep(0.005)
+        else:
+            send([pending.pop(0)])
+
+    # A real client flushes its batch on exit; unsent singles are lost
+    if use_control and control["batchInterval"] > 0 and pending:
+        send(pending)
+        pending = []
+    stats["unsent"] = len(pending)
+    results.append((stats, generated_levels))
+
+
+def start_bench_server(log_dir, settings=None):
+    """Start run_server() in a child process. Returns (process, url, stop, stats)"""
+    port_queue = multiprocessing.Queue()
+    stats_queue = multiprocessing.Queue()
+    stop_event = multiprocessing.Event()
+    server = multiprocessing.Process(
+        target=run_server,
+        args=(port_queue, stats_queue, stop_event, log_dir, settings),
+    )
+    server.start()
+    url = f"http://127.0.0.1:{port_queue.get()}/logs"
+    return server, url, stop_event, stats_queue
+
+
+def run_bench(use_control, clients, rate, duration, settings=None):
+    log_dir = tempfile.mkdtemp(prefix="bench_logs_")
+    server, url, stop_event, stats_queue = start_bench_server(log_dir, settings)
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=run_client,
+            args=(url, i, rate, duration, use_control, results),
+        )
+        for i in range(clients)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stop_event.set()
+    server_stats = stats_queue.get()
+    server.join()
+
+    total = {k: sum(r[k] for r, _ in results) for k in results[0][0]}
+    total["generated_levels"] = {
+        level: sum(levels[level] for _, levels in results) for level in results[0][1]
+    }
+    total.update(server_stats)
+    return total
+
+
+def print_result(name, r):
+    # End-to-end: everything generated that never reached the log file,
+    # including what the control block filtered out at the source
+    lost = r["generated"] - r["written"]
+    loss_pct = lost / r["generated"] * 100 if r["generated"] else 0.0
+    transit = lost - r["filtered"]
+    print(f"\n[{name}]")
+    print(f"  generated:      {r['generated']}")
+    print(f"  filtered (src): {r['filtered']}")
+    print(f"  requests:       {r['requests']}")
+    print(f"  sent:           {r['sent']}  (failed {r['failed']}, unsent {r['unsent']})")
+    print(
+        f"  server:         {r['received']} received, {r['written']} written, "
+        f"{r['rate_limited']} rate-limited, {r['dropped']} dropped"
+    )
+    print(
+        f"  event loss:     {lost} of {r['generated']} ({loss_pct:.1f}% end-to-end): "
+        f"{r['filtered']} filtered at source, {transit} lost after filtering"
+    )
+    for level, generated in r["generated_levels"].items():
+        written = r["levels"].get(level, 0)
+        pct = written / generated * 100 if generated else 0.0
+        print(f"    {level + ':':<8}      {written} / {generated} written ({pct:.1f}%)")
+    print(f"  server CPU:     {r['cpu']:.2f}s during flood, {r['cpu_total']:.2f}s total")
+
+
+def run_override_check():
+    """
+    One Info-only client muted by a "*" minLevel override for the first half
+    of the run. Without expiring control blocks it would never hear that the
+    override was removed, since it never sends anything to get a reply.
+    """
+    log_dir = tempfile.mkdtemp(prefix="bench_logs_")
+    control_file = os.path.join(log_dir, "logs", "control.json")
+    os.makedirs(os.path.dirname(control_file))
+    with open(control_file, "w", encoding="utf-8") as f:
+        json.dump({"*": {"minLevel": "Warning"}}, f)
+
+    server, url, stop_event, stats_queue = start_bench_server(
+        log_dir, {"CONTROL_TTL_SEC": OVERRIDE_TTL}
+    )
+    rng = random.Random(0)
+    client_control = ClientControl()
+    sent_times = []
+    removed_at = None
+    start = time.monotonic()
+    generated = 0
+
+    while time.monotonic() - start < OVERRIDE_DURATION:
+        now = time.monotonic()
+        if removed_at is None and now - start >= OVERRIDE_DURATION / 2:
+            os.remove(control_file)
+            removed_at = now
+
+        if int((now - start) * OVERRIDE_RATE) <= generated:
+            time.sleep(0.005)
+            continue
+        generated += 1
+        if not client_control.allows("Info", rng):
+            continue
+        event = {"message": f"event {generated}", "level": "Info", "username": "Muted"}
+        response = post(url, event)
+        if response is not None:
+            sent_times.append(time.monotonic())
+            client_control.update(response)
+
+    stop_event.set()
+    stats_queue.get()
+    server.join()
+
+    before = sum(1 for t in sent_times if t < removed_at)
+    after = [t for t in sent_times if t >= removed_at]
+    print(f"\n[override check] Info-only client, override removed after {OVERRIDE_DURATION / 2:.0f}s")
+    print(f"  generated:      {generated}")
+    print(f"  sent (muted):   {before}  (one probe per {OVERRIDE_TTL}s control ttl)")
+    if after:
+        print(f"  sent (after):   {len(after)}, resumed {after[0] - removed_at:.2f}s after removal")
+    else:
+        print(f"  sent (after):   0  (client never resumed)")
+
+
+def main():
+    args = [int(a) for a in sys.argv[1:4]]
+    clients, rate, duration = args + [CLIENTS, EVENTS_PER_SEC, DURATION][len(args) :]
+    drop = sys.argv[4:5] == ["drop"]
+    settings = {"RATE_LIMIT_DROP": drop}
+
+    print(
+        f"Flooding with {clients} clients x {rate} events/s for {duration}s "
+        f"({clients * rate * duration} events per run)"
+    )
+    print(
+        f"Server: queued writer, RATE_LIMIT_DROP {'on' if drop else 'off'} "
+        f"(\"without control\" is not the old synchronous server)"
+    )
+    print_result("without control", run_bench(False, clients, rate, duration, settings))
+    print_result("with control", run_bench(True, clients, rate, duration, settings))
+    run_override_check()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,18 @@
 WindUI Remote Log Server v2.1
 Receives logs from Roblox client and displays them in terminal
 + Auto IP update for lua files
++ Adaptive log control returned in every /logs response
 """
 
 import http.server
 import socketserver
 import json
 import os
+import queue
 import re
 import socket
+import threading
+import time
 from datetime import datetime
 from urllib.parse import parse_qs, urlparse
 import sys
@@ -35,6 +39,29 @@ LUA_FILES_TO_UPDATE = [
 # Python files that also need IP update
 PY_FILES_TO_UPDATE = []
 
+# Adaptive log control (sent back to clients in every /logs response)
+INGEST_QUEUE_MAX = 2000  # Pending events before new ones are dropped
+RATE_LIMIT_PER_SEC = 50  # Lines/sec per user that count as "over the limit"
+# Opt-in: also drop single (non-batched) Info lines from users over the limit.
+# Off by default so a debug session never silently loses lines
+RATE_LIMIT_DROP = False
+RATE_LIMIT_NOTICE_SEC = 10  # Repeat the "dropping Info" notice at most this often
+CONTROL_HOLD_SEC = 5  # Keep a stricter control this long before relaxing
+CONTROL_TTL_SEC = 10  # Clients fall back to defaults after this (and re-ask)
+INGEST_DRAIN_TIMEOUT = 30  # Seconds to flush queued logs on shutdown
+# Per-user overrides, editable while the server runs:
+# {"PlayerName": {"minLevel": "Warning"}, "*": {"batchInterval": 2}}
+LOG_CONTROL_FILE = os.path.join(LOGS_FOLDER, "control.json")
+LOG_LEVELS = {"Info": 1, "Success": 1, "Warning": 2, "Error": 3}
+
+# Control tiers, from idle to saturated
+CONTROL_TIERS = [
+    {"minLevel": "Info", "infoSampleRate": 1.0, "batchInterval": 0},
+    {"minLevel": "Info", "infoSampleRate": 1.0, "batchInterval": 1},
+    {"minLevel": "Info", "infoSampleRate": 0.25, "batchInterval": 2},
+    {"minLevel": "Warning", "infoSampleRate": 0.0, "batchInterval": 5},
+]
+
 
 # ANSI Colors
 class Colors:
@@ -52,6 +79,20 @@ class Colors:
 session_file = None
 log_count = 0
 
+# Ingest state (shared between request threads and the writer thread)
+ingest_queue = queue.Queue(maxsize=INGEST_QUEUE_MAX)
+ingest_stats = {"received": 0, "written": 0, "dropped": 0, "rate_limited": 0}
+written_levels = {}  # level -> events written
+ingest_lock = threading.Lock()
+ingest_idle = threading.Condition(ingest_lock)  # Notified when nothing is pending
+ingest_pending = 0  # Events queued or being written
+ingest_worker = None
+user_rates = {}  # username -> [window_start, count, last_window_count]
+user_tiers = {}  # username -> (tier, since)
+user_notices = {}  # username -> last "dropping Info" notice time
+last_user_prune = 0.0
+control_overrides = {"mtime": None, "data": {}}
+
 
 def get_local_ip():
     try:
@@ -266,6 +307,243 @@ def save_to_file(data):
         f.write(f"[{time}][{level}] {message}\n")
 
 
+def level_rank(level):
+    return LOG_LEVELS.get(level, 1)
+
+
+def prune_user_state(now):
+    """Forget idle users (usernames are client-supplied). Call under ingest_lock"""
+    global last_user_prune
+    if now - last_user_prune < 1:
+        return
+    last_user_prune = now
+
+    for username in [u for u, w in user_rates.items() if now - w[0] > CONTROL_HOLD_SEC]:
+        del user_rates[username]
+    for username in [u for u, t in user_tiers.items() if now - t[1] >= CONTROL_HOLD_SEC]:
+        del user_tiers[username]
+    for username in [u for u, t in user_notices.items() if now - t >= RATE_LIMIT_NOTICE_SEC]:
+        del user_notices[username]
+
+
+def track_user_rate(username, count=1):
+    """Count events for a user in 1s windows and return the current rate"""
+    now = time.monotonic()
+    with ingest_lock:
+        prune_user_state(now)
+        window = user_rates.get(username)
+        if window is None or now - window[0] >= 2:
+            window = [now, 0, 0]
+        elif now - window[0] >= 1:
+            window = [now, 0, window[1]]
+        window[1] += count
+        user_rates[username] = window
+        return max(window[1], window[2])
+
+
+def ingest(data, batched=False):
+    """
+    Queue a log event for the writer thread. Returns False if dropped.
+    Batched events are already counted by ingest_batch() and are never
+    rate-limited, since batching is what the control block asks for.
+    """
+    # Client-supplied; anything unhashable would break the per-user dicts
+    data["username"] = str(data.get("username", "Unknown"))
+    rate = 0 if batched else track_user_rate(data["username"])
+
+    with ingest_lock:
+        ingest_stats["received"] += 1
+        over_limit = (
+            RATE_LIMIT_DROP
+            and rate > RATE_LIMIT_PER_SEC
+            and level_rank(data.get("level")) <= 1
+        )
+        if over_limit:
+            ingest_stats["rate_limited"] += 1
+            now = time.monotonic()
+            notify = now - user_notices.get(data["username"], 0) >= RATE_LIMIT_NOTICE_SEC
+            if notify:
+                user_notices[data["username"]] = now
+
+    if over_limit:
+        if notify:
+            print(
+                f"{Colors.YELLOW}[!] Dropping Info from @{data['username']} "
+                f"(over {RATE_LIMIT_PER_SEC}/s){Colors.RESET}"
+            )
+        return False
+
+    try:
+        enqueue(("log", data))
+        return True
+    except queue.Full:
+        with ingest_lock:
+            ingest_stats["dropped"] += 1
+        return False
+
+
+def enqueue(item, block=False):
+    """Put an item on ingest_queue and count it as pending. Raises queue.Full"""
+    global ingest_pending
+    with ingest_lock:
+        ingest_pending += 1
+    try:
+        ingest_queue.put(item, block=block)
+    except queue.Full:
+        finish_pending()
+        raise
+
+
+def finish_pending():
+    global ingest_pending
+    with ingest_idle:
+        ingest_pending -= 1
+        if ingest_pending == 0:
+            ingest_idle.notify_all()
+
+
+def get_pending_count():
+    with ingest_lock:
+        return ingest_pending
+
+
+def ingest_batch(data):
+    """Queue a {"type": "batch"} payload, spreading its rate over its time span"""
+    username = str(data.get("username", "Unknown"))
+    logs = data.get("logs")
+    if not isinstance(logs, list):
+        logs = []
+    # Skip malformed entries instead of failing the whole request
+    logs = [log for log in logs if isinstance(log, dict)]
+
+    # A batch covers batchInterval seconds (or its timestamps' span), not one
+    stamps = [
+        log["timestamp"] for log in logs if isinstance(log.get("timestamp"), (int, float))
+    ]
+    span = max(stamps) - min(stamps) if stamps else 0
+    if isinstance(data.get("batchInterval"), (int, float)):
+        span = max(span, data["batchInterval"])
+    track_user_rate(username, len(logs) / max(span, 1))
+
+    for log in logs:
+        log.setdefault("username", username)
+        log.setdefault("userId", data.get("userId", "N/A"))
+        ingest(log, batched=True)
+
+
+def ingest_loop():
+    """Writer thread: print and save queued events"""
+    while True:
+        kind, data = ingest_queue.get()
+        try:
+            if kind == "session":
+                handle_session_upload(data)
+            else:
+                log_to_terminal(data)
+                save_to_file(data)
+                level = data.get("level", "Info")
+                with ingest_lock:
+                    ingest_stats["written"] += 1
+                    written_levels[level] = written_levels.get(level, 0) + 1
+        except Exception as e:
+            print(f"{Colors.RED}[ERROR] Failed to write log: {e}{Colors.RESET}")
+        finally:
+            finish_pending()
+
+
+def start_ingest_worker():
+    global ingest_worker
+    if ingest_worker is None:
+        ingest_worker = threading.Thread(target=ingest_loop, daemon=True)
+        ingest_worker.start()
+
+
+def drain_ingest_queue(timeout=INGEST_DRAIN_TIMEOUT):
+    """Wait for the writer thread to finish queued events. Returns how many are left"""
+    deadline = time.monotonic() + timeout
+    with ingest_idle:
+        # Short waits keep Ctrl+C responsive on every platform
+        while ingest_pending and time.monotonic() < deadline:
+            ingest_idle.wait(min(0.5, max(deadline - time.monotonic(), 0)))
+        return ingest_pending
+
+
+def load_control_overrides():
+    """Read LOG_CONTROL_FILE again whenever it changes on disk"""
+    try:
+        mtime = os.path.getmtime(LOG_CONTROL_FILE)
+    except OSError:
+        control_overrides.update(mtime=None, data={})
+        return control_overrides["data"]
+
+    if mtime != control_overrides["mtime"]:
+        try:
+            with open(LOG_CONTROL_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                raise ValueError("expected a JSON object")
+            print(f"{Colors.GREEN}[✓] Loaded log control overrides{Colors.RESET}")
+        except (OSError, ValueError) as e:
+            print(f"{Colors.RED}[ERROR] Bad {LOG_CONTROL_FILE}: {e}{Colors.RESET}")
+            data = {}
+        control_overrides.update(mtime=mtime, data=data)
+
+    return control_overrides["data"]
+
+
+def apply_control_override(control, override):
+    if not isinstance(override, dict):
+        return
+    if override.get("minLevel") in LOG_LEVELS:
+        control["minLevel"] = override["minLevel"]
+    if isinstance(override.get("infoSampleRate"), (int, float)):
+        control["infoSampleRate"] = min(max(float(override["infoSampleRate"]), 0.0), 1.0)
+    if isinstance(override.get("batchInterval"), (int, float)):
+        control["batchInterval"] = min(max(override["batchInterval"], 0), 60)
+
+
+def compute_log_control(username):
+    """Pick a control tier from queue depth and the user's send rate"""
+    load = ingest_queue.qsize() / INGEST_QUEUE_MAX
+    with ingest_lock:
+        window = user_rates.get(username)
+        rate = max(window[1], window[2]) if window else 0
+
+    if load >= 0.75 or rate > RATE_LIMIT_PER_SEC * 2:
+        tier = 3
+    elif load >= 0.5 or rate > RATE_LIMIT_PER_SEC:
+        tier = 2
+    elif load >= 0.25 or rate > RATE_LIMIT_PER_SEC / 2:
+        tier = 1
+    else:
+        tier = 0
+
+    # Hold stricter tiers for a while so sampled clients don't flap
+    now = time.monotonic()
+    with ingest_lock:
+        held, since = user_tiers.get(username, (0, now))
+        if tier >= held or now - since >= CONTROL_HOLD_SEC:
+            user_tiers[username] = (tier, now)
+        else:
+            tier = held
+
+    control = dict(CONTROL_TIERS[tier])
+    overrides = load_control_overrides()
+    apply_control_override(control, overrides.get("*"))
+    apply_control_override(control, overrides.get(username))
+    # Muted clients only hear back when they send, so every block expires
+    control["ttl"] = CONTROL_TTL_SEC
+    return control
+
+
+def get_ingest_stats():
+    with ingest_lock:
+        stats = dict(ingest_stats)
+        stats["levels"] = dict(written_levels)
+    stats["queued"] = ingest_queue.qsize()
+    return stats
+
+
 class LogHandler(http.server.SimpleHTTPRequestHandler):
     def end_headers(self):
         self.send_header(
@@ -281,6 +559,14 @@ class LogHandler(http.server.SimpleHTTPRequestHandler):
         if "/logs" not in msg:
             print(f"{Colors.GRAY}[HTTP] {msg}{Colors.RESET}")
 
+    def send_status(self, username):
+        """Reply with ok + the log control block for this user"""
+        body = json.dumps({"status": "ok", "control": compute_log_control(username)})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body.encode("utf-8"))
+
     def do_POST(self):
         if self.path == "/logs" or self.path.startswith("/logs?"):
             content_length = int(self.headers.get("Content-Length", 0))
@@ -288,17 +574,17 @@ class LogHandler(http.server.SimpleHTTPRequestHandler):
 
             try:
                 data = json.loads(body)
+                if not isinstance(data, dict):
+                    raise json.JSONDecodeError("expected a JSON object", body, 0)
 
                 if data.get("type") == "session_upload":
-                    handle_session_upload(data)
+                    enqueue(("session", data), block=True)
+                elif data.get("type") == "batch":
+                    ingest_batch(data)
                 else:
-                    log_to_terminal(data)
-                    save_to_file(data)
+                    ingest(data)
 
-                self.send_response(200)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(b'{"status":"ok"}')
+                self.send_status(str(data.get("username", "Unknown")))
             except json.JSONDecodeError as e:
                 print(f"{Colors.RED}[ERROR] Invalid JSON: {e}{Colors.RESET}")
                 self.send_response(400)
@@ -312,18 +598,16 @@ class LogHandler(http.server.SimpleHTTPRequestHandler):
 
         if parsed.path == "/logs":
             query = parse_qs(parsed.query)
+            username = "Unknown"
             if "data" in query:
                 try:
                     data = json.loads(query["data"][0])
-                    log_to_terminal(data)
-                    save_to_file(data)
+                    username = str(data.get("username", "Unknown"))
+                    ingest(data)
                 except:
                     pass
 
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(b'{"status":"ok"}')
+            self.send_status(username)
             return
 
         if SERVE_FILES:
@@ -356,17 +640,38 @@ def start_server():
 {Colors.GREEN}[✓]{Colors.RESET} Server URL: {Colors.BOLD}http://{local_ip}:{PORT}{Colors.RESET}
 {Colors.GREEN}[✓]{Colors.RESET} Log Endpoint: {Colors.BOLD}http://{local_ip}:{PORT}/logs{Colors.RESET}
 {Colors.GREEN}[✓]{Colors.RESET} Logs Folder: {Colors.BOLD}{os.path.abspath(LOGS_FOLDER)}{Colors.RESET}
+{Colors.GREEN}[✓]{Colors.RESET} Log Overrides: {Colors.BOLD}{os.path.abspath(LOG_CONTROL_FILE)}{Colors.RESET}
 {Colors.GREEN}[✓]{Colors.RESET} Serving from: {Colors.BOLD}{os.getcwd()}{Colors.RESET}
 {Colors.CYAN}{"=" * 50}{Colors.RESET}
 {Colors.YELLOW}[!] Waiting for logs... (Ctrl+C to stop){Colors.RESET}
 """)
 
-    socketserver.TCPServer.allow_reuse_address = True
-    with socketserver.TCPServer(("", PORT), LogHandler) as httpd:
+    start_ingest_worker()
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    socketserver.ThreadingTCPServer.daemon_threads = True
+    with socketserver.ThreadingTCPServer(("", PORT), LogHandler) as httpd:
         try:
             httpd.serve_forever()
         except KeyboardInterrupt:
             print(f"\n{Colors.RED}[!] Server stopped.{Colors.RESET}")
+
+            # Accepted logs (and session uploads) are still in the queue
+            pending = get_pending_count()
+            if pending:
+                print(f"{Colors.YELLOW}[*] Flushing {pending} queued log(s)...{Colors.RESET}")
+                try:
+                    left = drain_ingest_queue()
+                except KeyboardInterrupt:
+                    left = get_pending_count()
+                if left:
+                    print(f"{Colors.RED}[!] {left} queued log(s) not written{Colors.RESET}")
+
+            stats = get_ingest_stats()
+            print(
+                f"{Colors.CYAN}[i] Logs: {stats['received']} received, "
+                f"{stats['written']} written, {stats['rate_limited']} rate-limited, "
+                f"{stats['dropped']} dropped (queue full){Colors.RESET}"
+            )
             if session_file:
                 print(f"{Colors.GREEN}[✓] Logs saved to: {session_file}{Colors.RESET}")
 
@@ -3,12 +3,18 @@
 Nforst GitHub Manager
 - Push: Update URLs to production and push to repo
 - Backup: Create local backup before pushing
+- Build: Optional strip/minify of Lua sources for production pushes
 """
 
+import hashlib
+import json
 import os
 import re
 import shutil
 import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 # Configuration
@@ -32,6 +38,7 @@ EXCLUDE_FILES = [
     "backups",
     "__pycache__",
     ".git",
+    ".build_cache",
 ]
 
 # Files that need URL replacement
@@ -51,6 +58,24 @@ URL_REPLACEMENTS = [
     },
 ]
 
+# Optional build stage for production pushes
+# "strip"  = remove comments, indentation and blank lines (keeps line breaks)
+# "minify" = strip + join everything onto as few lines as possible
+# Built files are committed in a temporary git worktree on top of the source
+# commit, so only the pushed branch holds build output (never the local one)
+BUILD_MODE = "minify"
+# Files/folders (relative to project root) that get built before pushing
+BUILD_TARGETS = [
+    "main.lua",
+    "Libs",
+    "Src",
+    "WindUI/dist/main.lua",
+]
+BUILD_CACHE_DIR = os.path.join(PROJECT_DIR, ".build_cache")
+BUILD_WORKERS = None  # None = one worker per CPU
+# Bump when the minifier output changes so old cache entries are ignored
+BUILD_VERSION = "1"
+
 
 # ANSI Colors
 class Colors:
@@ -78,6 +103,7 @@ def print_menu():
   {Colors.GREEN}[1]{Colors.RESET} Push to GitHub  - Update URLs & push to repo
   {Colors.YELLOW}[2]{Colors.RESET} Backup          - Create local backup
   {Colors.BLUE}[3]{Colors.RESET} Restore Local   - Revert URLs to local server
+  {Colors.CYAN}[4]{Colors.RESET} Build Preview   - Report {BUILD_MODE} sizes (no changes)
   {Colors.RED}[0]{Colors.RESET} Exit
 """)
 
@@ -165,8 +191,451 @@ def create_backup():
     return backup_path
 
 
-def push_to_github():
-    """Update URLs and push to GitHub"""
+# ============================================
+# LUA BUILD (strip / minify)
+# ============================================
+class LuaSyntaxError(Exception):
+    pass
+
+
+LUA_NAME_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+LUA_NUMBER_RE = re.compile(
+    r"0[xX][0-9a-fA-F_]*(?:\.[0-9a-fA-F_]*)?(?:[pP][+-]?[0-9_]+)?"
+    r"|0[bB][01_]+"
+    r"|(?:[0-9][0-9_]*(?:\.[0-9_]*)?|\.[0-9][0-9_]*)(?:[eE][+-]?[0-9_]+)?"
+)
+LUA_SPACE_RE = re.compile(r"[ \t\r\n\f\v]+")
+LUA_OPERATORS = [
+    "...", "..=", "//=",
+    "..", "==", "~=", "<=", ">=", "//", "::", "->",
+    "+=", "-=", "*=", "/=", "%=", "^=", "<<", ">>",
+    "+", "-", "*", "/", "%", "^", "#", "&", "~", "|", "<", ">", "=",
+    "(", ")", "{", "}", "[", "]", ";", ":", ",", ".", "?",
+]
+# Leading comments kept in the output (Luau directives and license headers)
+LUA_KEEP_COMMENT_RE = re.compile(r"^--!|license|copyright", re.IGNORECASE)
+
+
+def _long_bracket_level(src, i):
+    """Return the level of a long bracket opening at src[i], or -1"""
+    if src[i] != "[":
+        return -1
+    j = i + 1
+    while j < len(src) and src[j] == "=":
+        j += 1
+    if j < len(src) and src[j] == "[":
+        return j - i - 1
+    return -1
+
+
+def _scan_long_bracket(src, i, level):
+    """Return the index just past the long bracket starting at src[i]"""
+    close = "]" + "=" * level + "]"
+    end = src.find(close, i + level + 2)
+    if end == -1:
+        raise LuaSyntaxError(f"unfinished long string/comment at offset {i}")
+    return end + len(close)
+
+
+def _scan_quoted(src, i):
+    """Return the index just past the '...' or "..." string starting at src[i]"""
+    quote = src[i]
+    j = i + 1
+    while j < len(src):
+        c = src[j]
+        if c == "\\":
+            if src.startswith("z", j + 1):
+                # \z skips the following whitespace, line breaks included
+                m = LUA_SPACE_RE.match(src, j + 2)
+                j = m.end() if m else j + 2
+            else:
+                j += 3 if src.startswith("\r\n", j + 1) else 2
+            continue
+        if c == quote:
+            return j + 1
+        if c == "\n":
+            break
+        j += 1
+    raise LuaSyntaxError(f"unfinished string at offset {i}")
+
+
+def _scan_interpolated(src, i):
+    """Return the index just past the `...` string starting at src[i]"""
+    j = i + 1
+    while j < len(src):
+        c = src[j]
+        if c == "\\":
+            j += 2
+        elif c == "`":
+            return j + 1
+        elif c == "{":
+            # Skip the embedded expression token by token
+            depth = 1
+            j += 1
+            while depth:
+                j, kind, text = _next_lua_token(src, j)
+                if kind is None:
+                    raise LuaSyntaxError(f"unfinished interpolation at offset {i}")
+                if text == "{":
+                    depth += 1
+                elif text == "}":
+                    depth -= 1
+        else:
+            j += 1
+    raise LuaSyntaxError(f"unfinished string at offset {i}")
+
+
+def _next_lua_token(src, i):
+    """Skip whitespace and return (end, kind, text) for the token at src[i]"""
+    m = LUA_SPACE_RE.match(src, i)
+    if m:
+        i = m.end()
+    if i >= len(src):
+        return i, None, ""
+
+    c = src[i]
+    if src.startswith("--", i):
+        level = _long_bracket_level(src, i + 2) if i + 2 < len(src) else -1
+        if level >= 0:
+            end = _scan_long_bracket(src, i + 2, level)
+        else:
+            end = src.find("\n", i)
+            end = len(src) if end == -1 else end
+        return end, "comment", src[i:end]
+    if c == '"' or c == "'":
+        end = _scan_quoted(src, i)
+        return end, "string", src[i:end]
+    if c == "`":
+        end = _scan_interpolated(src, i)
+        return end, "string", src[i:end]
+    if c == "[":
+        level = _long_bracket_level(src, i)
+        if level >= 0:
+            end = _scan_long_bracket(src, i, level)
+            return end, "string", src[i:end]
+
+    m = LUA_NAME_RE.match(src, i)
+    if m:
+        return m.end(), "name", m.group()
+    m = LUA_NUMBER_RE.match(src, i)
+    if m:
+        return m.end(), "number", m.group()
+    for op in LUA_OPERATORS:
+        if src.startswith(op, i):
+            return i + len(op), "op", op
+
+    line = src.count("\n", 0, i) + 1
+    raise LuaSyntaxError(f"unexpected character {c!r} on line {line}")
+
+
+def lex_lua(src):
+    """Split Lua/Luau source into (kind, text, newline_before) tuples"""
+    tokens = []
+    i = 0
+    newline = False
+    while True:
+        start = i
+        i, kind, text = _next_lua_token(src, i)
+        if "\n" in src[start : i - len(text)]:
+            newline = True
+        if kind is None:
+            return tokens
+        tokens.append((kind, text, newline))
+        # A newline before/inside a comment still separates the next token
+        newline = kind == "comment" and (newline or "\n" in text)
+
+
+def _needs_space(prev, nxt):
+    """True if prev and nxt would merge into different tokens when joined"""
+    pkind, ptext = prev[0], prev[1]
+    nkind, ntext = nxt[0], nxt[1]
+    if pkind in ("name", "number") and nkind in ("name", "number"):
+        return True
+    if pkind == "number" and ntext.startswith("."):
+        return True
+    if pkind != "op":
+        return False
+    if nkind == "string":
+        return ntext.startswith("[") and ptext.endswith("[")
+    try:
+        joined = [t[1] for t in lex_lua(ptext + ntext)]
+    except LuaSyntaxError:
+        return True
+    return joined != [ptext, ntext]
+
+
+def _emit_lua(tokens, mode):
+    """Rebuild source from tokens, keeping only header directive/license comments"""
+    out = []
+    prev = None
+    for tok in tokens:
+        kind, text, newline = tok
+        if kind == "comment":
+            if prev is None and LUA_KEEP_COMMENT_RE.search(text):
+                out.append(text + "\n")
+            continue
+        if prev is not None:
+            if newline and (mode == "strip" or text == "("):
+                # Keep the break before "(" so "f\n(g)()" can't become a call
+                out.append("\n")
+            elif _needs_space(prev, tok):
+                out.append(" ")
+        out.append(text)
+        prev = tok
+    return "".join(out) + "\n"
+
+
+def build_lua(src, mode=BUILD_MODE):
+    """
+    Strip/minify Lua source.
+    Returns (output, status) where status is "ok", "fallback" or "invalid".
+    Output is only used if it lexes back to the exact same token stream.
+    """
+    try:
+        tokens = lex_lua(src)
+    except LuaSyntaxError:
+        return src, "invalid"
+
+    code = [t[:2] for t in tokens if t[0] != "comment"]
+    modes = [mode, "strip"] if mode == "minify" else [mode]
+    for i, m in enumerate(modes):
+        output = _emit_lua(tokens, m)
+        try:
+            rebuilt = [t[:2] for t in lex_lua(output) if t[0] != "comment"]
+        except LuaSyntaxError:
+            continue
+        if rebuilt == code and len(output) < len(src):
+            return output, "ok" if i == 0 else "fallback"
+
+    return src, "fallback"
+
+
+# Lexer/emitter edge cases checked before every build: (source, mode, output).
+# Re-lex validation can't catch a lexer bug shared by input and output
+LUA_SELFCHECK_CASES = [
+    ("f\n(g)", "minify", "f\n(g)\n"),  # Newline before "(" is not a call
+    ("a = b\n-- c\n(f)()", "minify", "a=b\n(f)()\n"),
+    ("a - -b", "minify", "a- -b\n"),  # "--" would start a comment
+    ("1 .. 2", "minify", "1 ..2\n"),  # "1.." is a malformed number
+    ("a = 1 .. .5", "minify", "a=1 .. .5\n"),
+    ("a[ [[x]] ]", "minify", "a[ [[x]]]\n"),  # "[[[" would open a long string
+    ("x = a // b - - 1", "minify", "x=a//b- -1\n"),
+    ('x = `{f("}")}`', "minify", 'x=`{f("}")}`\n'),
+    ("x = `a{ {y=1} }b`", "minify", "x=`a{ {y=1} }b`\n"),
+    ('local s = "a\\z\n   b"', "minify", 'local s="a\\z\n   b"\n'),
+    ("--!strict\n-- note\nlocal a = 1", "minify", "--!strict\nlocal a=1\n"),
+    ("local a = 1\nlocal b = 2", "minify", "local a=1 local b=2\n"),
+    ("local a = 1\nlocal b = 2", "strip", "local a=1\nlocal b=2\n"),
+]
+# Sources that must lex to exactly these token texts
+LUA_SELFCHECK_TOKENS = [
+    ('x = `{f("}")}`', ["x", "=", '`{f("}")}`']),
+    ('s = "a\\z\n  b"', ["s", "=", '"a\\z\n  b"']),
+    ("t[ [=[a]]b]=] ]", ["t", "[", "[=[a]]b]=]", "]"]),
+]
+
+
+def lua_selfcheck():
+    """Run the lexer/emitter edge cases. Returns a list of failure messages"""
+    failures = []
+    for src, mode, expected in LUA_SELFCHECK_CASES:
+        try:
+            output = _emit_lua(lex_lua(src), mode)
+        except LuaSyntaxError as e:
+            output = f"<{e}>"
+        if output != expected:
+            failures.append(f"{mode} {src!r}: got {output!r}, expected {expected!r}")
+    for src, expected in LUA_SELFCHECK_TOKENS:
+        try:
+            texts = [t[1] for t in lex_lua(src)]
+        except LuaSyntaxError as e:
+            texts = [f"<{e}>"]
+        if texts != expected:
+            failures.append(f"lex {src!r}: got {texts!r}, expected {expected!r}")
+    return failures
+
+
+def _build_worker(job):
+    """Process pool entry point: (relpath, source, mode) -> result tuple"""
+    relpath, src, mode = job
+    start = time.perf_counter()
+    output, status = build_lua(src, mode)
+    return relpath, output, status, (time.perf_counter() - start) * 1000
+
+
+def collect_build_files(base=PROJECT_DIR):
+    """Expand BUILD_TARGETS into a sorted list of .lua paths (relative to base)"""
+    files = set()
+    for target in BUILD_TARGETS:
+        path = os.path.join(base, target)
+        if os.path.isfile(path):
+            files.add(os.path.relpath(path, base))
+        elif os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs[:] = [d for d in dirs if d not in EXCLUDE_FILES]
+                for name in names:
+                    if name.endswith(".lua"):
+                        files.add(os.path.relpath(os.path.join(root, name), base))
+        else:
+            print(f"  {Colors.YELLOW}[!] Skip: {target} not found{Colors.RESET}")
+    return sorted(files)
+
+
+def _load_build_manifest():
+    path = os.path.join(BUILD_CACHE_DIR, "manifest.json")
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_build_manifest(manifest):
+    path = os.path.join(BUILD_CACHE_DIR, "manifest.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+
+def build_sources(mode=BUILD_MODE, base=None):
+    """
+    Build all BUILD_TARGETS under `base` in place (a deploy worktree).
+    With base=None the project sources are only measured and reported.
+    """
+    print(f"\n{Colors.CYAN}[*] Building Lua ({mode})...{Colors.RESET}")
+
+    failures = lua_selfcheck()
+    if failures:
+        for failure in failures:
+            print(f"  {Colors.RED}[✗] Self-check: {failure}{Colors.RESET}")
+        raise RuntimeError(f"Lua lexer self-check failed ({len(failures)} case(s))")
+
+    if not os.path.exists(BUILD_CACHE_DIR):
+        os.makedirs(BUILD_CACHE_DIR)
+    manifest = _load_build_manifest()
+
+    sources = {}
+    results = {}
+    jobs = []
+    for relpath in collect_build_files(base or PROJECT_DIR):
+        with open(os.path.join(base or PROJECT_DIR, relpath), "r", encoding="utf-8", newline="") as f:
+            src = f.read()
+        sources[relpath] = src
+
+        key = hashlib.sha256(
+            f"{BUILD_VERSION}:{mode}:".encode("utf-8") + src.encode("utf-8")
+        ).hexdigest()
+        cache_path = os.path.join(BUILD_CACHE_DIR, f"{key}.lua")
+        if key in manifest and os.path.exists(cache_path):
+            with open(cache_path, "r", encoding="utf-8", newline="") as f:
+                results[relpath] = (f.read(), "cached", 0.0, key)
+        else:
+            jobs.append((relpath, src, mode))
+            results[relpath] = key
+
+    start = time.perf_counter()
+    if jobs:
+        with ProcessPoolExecutor(max_workers=BUILD_WORKERS) as pool:
+            for relpath, output, status, ms in pool.map(_build_worker, jobs):
+                key = results[relpath]
+                results[relpath] = (output, status, ms, key)
+                # Only cache output that passed validation
+                if status in ("ok", "fallback"):
+                    cache_path = os.path.join(BUILD_CACHE_DIR, f"{key}.lua")
+                    with open(cache_path, "w", encoding="utf-8", newline="") as f:
+                        f.write(output)
+                    manifest[key] = {"file": relpath, "status": status, "build_ms": ms}
+    wall_ms = (time.perf_counter() - start) * 1000
+    _save_build_manifest(manifest)
+
+    total_src = total_out = 0
+    total_ms = saved_ms = 0.0
+    for relpath in sorted(results):
+        output, status, ms, key = results[relpath]
+        src = sources[relpath]
+        src_size = len(src.encode("utf-8"))
+        out_size = len(output.encode("utf-8"))
+        total_src += src_size
+        total_out += out_size
+        total_ms += ms
+
+        if status == "cached":
+            saved_ms += manifest[key].get("build_ms", 0.0)
+            color, note = Colors.BLUE, f"cached, saved {manifest[key].get('build_ms', 0.0):.0f} ms"
+        elif status == "ok":
+            color, note = Colors.GREEN, f"{ms:.0f} ms"
+        elif status == "fallback":
+            color, note = Colors.YELLOW, f"{ms:.0f} ms, fallback"
+        else:
+            color, note = Colors.RED, "lex error, pushed as-is"
+
+        pct = (1 - out_size / src_size) * 100 if src_size else 0.0
+        print(
+            f"  {color}[{status}]{Colors.RESET} {relpath}: "
+            f"{src_size / 1024:.1f} KB → {out_size / 1024:.1f} KB (-{pct:.1f}%) [{note}]"
+        )
+
+    pct = (1 - total_out / total_src) * 100 if total_src else 0.0
+    print(
+        f"  {Colors.GREEN}[✓]{Colors.RESET} {len(results)} file(s): "
+        f"{total_src / 1024:.1f} KB → {total_out / 1024:.1f} KB (-{pct:.1f}%), "
+        f"build {wall_ms:.0f} ms ({len(jobs)} built, cache saved {saved_ms:.0f} ms)"
+    )
+
+    if base is None:
+        return
+    for relpath in sorted(results):
+        output = results[relpath][0]
+        if output != sources[relpath]:
+            with open(os.path.join(base, relpath), "w", encoding="utf-8", newline="") as f:
+                f.write(output)
+
+
+def commit_build(mode=BUILD_MODE):
+    """
+    Check out HEAD in a temporary worktree, build it there and commit the
+    result on a detached HEAD. Returns the worktree path, or None on failure.
+    The caller pushes from it and removes it with remove_build_worktree().
+    """
+    worktree = tempfile.mkdtemp(prefix="nforst_build_")
+    success, out, err = run_cmd(f'git worktree add --detach "{worktree}" HEAD')
+    if not success:
+        print(f"  {Colors.RED}[✗] Worktree failed: {err.strip()}{Colors.RESET}")
+        shutil.rmtree(worktree, ignore_errors=True)
+        return None
+
+    built = False
+    try:
+        build_sources(mode, worktree)
+        run_cmd("git add -A", cwd=worktree)
+        commit_msg = f"Build ({mode}) {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        success, out, err = run_cmd(f'git commit -m "{commit_msg}"', cwd=worktree)
+        if "nothing to commit" in (out + err):
+            print(f"  {Colors.YELLOW}[!] Build produced no changes{Colors.RESET}")
+        elif not success:
+            raise RuntimeError(err.strip())
+        else:
+            print(f"  {Colors.GREEN}[✓]{Colors.RESET} Committed: {commit_msg} (deploy only)")
+        built = True
+    except Exception as e:
+        print(f"  {Colors.RED}[✗] Build failed: {e}{Colors.RESET}")
+    finally:
+        # Also runs on Ctrl+C, so no worktree is left registered
+        if not built:
+            remove_build_worktree(worktree)
+
+    return worktree if built else None
+
+
+def remove_build_worktree(worktree):
+    run_cmd(f'git worktree remove --force "{worktree}"')
+    shutil.rmtree(worktree, ignore_errors=True)
+    run_cmd("git worktree prune")
+
+
+def push_to_github(build=False):
+    """Update URLs (and optionally build Lua) and push to GitHub"""
     print(f"\n{Colors.BOLD}=== Push to GitHub ==={Colors.RESET}")
 
     # Step 1: Create backup first
@@ -177,6 +646,21 @@ def push_to_github():
     print(f"\n{Colors.CYAN}[2/4] Updating URLs to GitHub...{Colors.RESET}")
     replace_urls(to_github=True)
 
+    try:
+        push_changes(build)
+    finally:
+        # Step 4: Restore URLs to local
+        print(f"\n{Colors.CYAN}[*] Restoring local URLs...{Colors.RESET}")
+        replace_urls(to_github=False)
+
+    print(f"\n{Colors.GREEN}{'=' * 50}")
+    print(f"  Push complete!")
+    print(f"  Raw URL: {PRODUCTION_BASE}main.lua")
+    print(f"{'=' * 50}{Colors.RESET}")
+
+
+def push_changes(build=False):
+    """Commit the working tree and force-push it (or its build) to GitHub"""
     # Step 3: Git operations
     print(f"\n{Colors.CYAN}[3/4] Git operations...{Colors.RESET}")
 
@@ -204,8 +688,25 @@ def push_to_github():
     else:
         print(f"  {Colors.GREEN}[✓]{Colors.RESET} Committed: {commit_msg}")
 
+    # Build output is committed on top of the source commit in a throwaway
+    # worktree and pushed from there; the local branch keeps the sources
+    worktree = None
+    if build:
+        worktree = commit_build(BUILD_MODE)
+        if worktree is None:
+            print(f"  {Colors.RED}[✗] Push skipped (build failed){Colors.RESET}")
+            return
+
     print(f"\n{Colors.CYAN}[4/4] Pushing to GitHub...{Colors.RESET}")
-    success, out, err = run_cmd(f"git push -u origin {GITHUB_BRANCH} --force")
+    if worktree:
+        try:
+            success, out, err = run_cmd(
+                f"git push origin HEAD:refs/heads/{GITHUB_BRANCH} --force", cwd=worktree
+            )
+        finally:
+            remove_build_worktree(worktree)
+    else:
+        success, out, err = run_cmd(f"git push -u origin {GITHUB_BRANCH} --force")
 
     if success or "Everything up-to-date" in (out + err):
         print(
@@ -217,15 +718,6 @@ def push_to_github():
             f"  {Colors.YELLOW}[!] Try: git push -u origin {GITHUB_BRANCH} --force{Colors.RESET}"
         )
 
-    # Step 4: Restore URLs to local
-    print(f"\n{Colors.CYAN}[*] Restoring local URLs...{Colors.RESET}")
-    replace_urls(to_github=False)
-
-    print(f"\n{Colors.GREEN}{'=' * 50}")
-    print(f"  Push complete!")
-    print(f"  Raw URL: {PRODUCTION_BASE}main.lua")
-    print(f"{'=' * 50}{Colors.RESET}")
-
 
 def restore_local():
     """Restore URLs to local server"""
@@ -264,12 +756,21 @@ def main():
                 f"\n{Colors.YELLOW}Push to GitHub? This will update all URLs. (y/n): {Colors.RESET}"
             )
             if confirm.lower() == "y":
-                push_to_github()
+                build = input(
+                    f"{Colors.YELLOW}Build Lua ({BUILD_MODE}) before pushing? "
+                    f"Only the pushed commit gets build output. (y/n): {Colors.RESET}"
+                )
+                push_to_github(build=build.lower() == "y")
         elif choice == "2":
             create_backup()
             list_backups()
         elif choice == "3":
             restore_local()
+        elif choice == "4":
+            try:
+                build_sources(BUILD_MODE)
+            except RuntimeError as e:
+                print(f"  {Colors.RED}[✗] {e}{Colors.RESET}")
         elif choice == "0":
             print(f"\n{Colors.CYAN}Goodbye!{Colors.RESET}\n")
             break